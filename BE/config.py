@@ -0,0 +1,24 @@
+from dotenv import load_dotenv
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+import os
+
+ENV_PATH = Path(__file__).parent / '.env'
+
+@lru_cache(maxsize=1)
+def load_env() -> bool:
+    """Load the .env file once per process"""
+    return load_dotenv(dotenv_path=ENV_PATH)
+
+@lru_cache(maxsize=1)
+def settings() -> SimpleNamespace:
+    """Environment-derived settings, read once and cached in memory"""
+    load_env()
+    return SimpleNamespace(
+        openai_api_key=os.environ.get("OPENAI_API_KEY"),
+        model=os.environ.get("OPENAI_MODEL", "gpt-4o"),
+        frontend_url=os.environ.get("FRONTEND_URL", "http://localhost:3000"),
+        log_level=os.environ.get("LOG_LEVEL", "WARNING"),
+        max_concurrency=int(os.environ.get("OPENAI_MAX_CONCURRENCY", "16")),
+    )
@@ -1,20 +1,65 @@
 # Load environment variables FIRST before any other imports
-from dotenv import load_dotenv
-from pathlib import Path
-import os
+from config import load_env, settings
+import time
+import logging
 
-env_path = Path(__file__).parent / '.env'
-load_dotenv(dotenv_path=env_path)
+load_env()
 
 # Now import other modules
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from routers import llm, report
+from services.openai_service import close_http_client
 from utils.logger import setup_logging
 
 # Setup logging
-setup_logging()
+setup_logging(settings().log_level)
+logger = logging.getLogger(__name__)
+
+class TimingMiddleware:
+    """Pure ASGI middleware that records request latency (avoids BaseHTTPMiddleware overhead)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        t0 = time.perf_counter()
+
+        async def send_wrap(message):
+            if message["type"] == "http.response.start":
+                elapsed_ms = (time.perf_counter() - t0) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"x-process-time", f"{elapsed_ms:.1f}ms".encode()))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrap)
+        finally:
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            logger.debug("%s %s completed in %.1fms", scope["method"], scope["path"], elapsed_ms)
+
+class SelectiveGZipMiddleware:
+    """Pure ASGI wrapper around GZipMiddleware that leaves streaming (SSE) routes uncompressed
+
+    GZipMiddleware buffers output into gzip blocks, which would hold back
+    text/event-stream messages; excluded paths bypass it entirely.
+    """
+
+    def __init__(self, app, exclude_paths=(), **gzip_options):
+        self.app = app
+        self.gzip_app = GZipMiddleware(app, **gzip_options)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] not in self.exclude_paths:
+            return await self.gzip_app(scope, receive, send)
+        await self.app(scope, receive, send)
 
 # Create FastAPI app
 app = FastAPI(
@@ -23,20 +68,38 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Compress JSON responses; added before CORS so CORS wraps it (last added runs outermost)
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    exclude_paths=("/api/generate-options/stream",),
+    minimum_size=512,
+    compresslevel=5,
+)
+
 # CORS configuration
-FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
+FRONTEND_URL = settings().frontend_url
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[FRONTEND_URL],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Process-Time"],
 )
+app.add_middleware(TimingMiddleware)
 
 # Include routers
 app.include_router(llm.router, prefix="/api", tags=["llm"])
 app.include_router(report.router, prefix="/api", tags=["report"])
 
+@app.on_event("startup")
+async def warm_openai_connections():
+    await llm.openai_service.warm_up()
+
+@app.on_event("shutdown")
+async def close_openai_connections():
+    await close_http_client()
+
 @app.get("/")
 async def root():
     return {
@@ -48,3 +111,8 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=8000)
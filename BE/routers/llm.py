@@ -1,17 +1,21 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
+import asyncio
 import logging
-import json
+import orjson
 
-from services.openai_service import OpenAIService
-from utils.logger import log_user_activity, log_llm_generation
+from services.openai_service import OpenAIService, parse_options
+from utils.logger import claim_batch_log, log_user_activity, log_llm_generation
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Request/Response Models
 class Step0Data(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
     values: List[str] = Field(default_factory=list)
     interests: List[str] = Field(default_factory=list)
     strengths: List[str] = Field(default_factory=list)
@@ -20,75 +24,117 @@ class Step0Data(BaseModel):
     concerns: Optional[str] = None
 
 class Step1Data(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
     problemDefinition: Optional[str] = None
     internalCues: List[str] = Field(default_factory=list)
     externalCues: List[str] = Field(default_factory=list)
     keyQuestions: List[str] = Field(default_factory=list)
 
 class Step2Data(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
     evaluationCriteria: List[str] = Field(default_factory=list)
     constraints: List[str] = Field(default_factory=list)
     informationTemplate: List[Dict[str, str]] = Field(default_factory=list)
 
 class GenerateOptionsRequest(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
     sessionId: str
     step0: Step0Data
     step1: Step1Data
     step2: Step2Data
 
+class CachedGenerateOptionsRequest(GenerateOptionsRequest):
+    # Only /generate-options reuses responses; regenerate skips the cache and samples new options
+    fresh: bool = False
+
 class GenerateOptionsResponse(BaseModel):
     success: bool
     options: Optional[List[Dict[str, Any]]] = None
     error: Optional[str] = None
     tokensUsed: Optional[Dict[str, int]] = None
 
+class BatchGenerateOptionsRequest(BaseModel):
+    # OpenAI rejects empty batch files and caps a batch at 50,000 requests
+    requests: List[GenerateOptionsRequest] = Field(min_length=1, max_length=50000)
+
+class BatchSubmitResponse(BaseModel):
+    success: bool
+    batchId: str
+    status: str
+
+class BatchOptionsResult(BaseModel):
+    sessionId: str
+    success: bool
+    options: Optional[List[Dict[str, Any]]] = None
+    error: Optional[str] = None
+    tokensUsed: Optional[Dict[str, int]] = None
+
+class BatchResultResponse(BaseModel):
+    success: bool
+    status: str
+    results: Optional[List[BatchOptionsResult]] = None
+    error: Optional[str] = None
+
 # Initialize OpenAI service
 openai_service = OpenAIService()
 
+def _dump_steps(request: GenerateOptionsRequest) -> Dict[str, Dict[str, Any]]:
+    """Serialize a request's step models once, for both logging and the LLM call"""
+    return {
+        "step0": request.step0.model_dump(),
+        "step1": request.step1.model_dump(),
+        "step2": request.step2.model_dump()
+    }
+
+def _sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format a Server-Sent Events message with a JSON payload"""
+    payload = orjson.dumps(data).decode()
+    if event:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f"data: {payload}\n\n"
+
 @router.post("/generate-options", response_model=GenerateOptionsResponse)
-async def generate_options(request: GenerateOptionsRequest):
+async def generate_options(request: CachedGenerateOptionsRequest):
     """
     Generate career/decision options using LLM based on Steps 0-2 data
     """
     try:
-        logger.info(f"Received generate options request for session: {request.sessionId}")
+        logger.debug("Received generate options request for session: %s", request.sessionId)
+        
+        step_data = _dump_steps(request)
         
         # Log user activity
         log_user_activity(
             session_id=request.sessionId,
             activity_type="generate_options_request",
-            data={
-                "step0": request.step0.model_dump(),
-                "step1": request.step1.model_dump(),
-                "step2": request.step2.model_dump()
-            }
+            data=step_data
         )
         
         # Call OpenAI service
-        result = openai_service.generate_options(
-            step0_data=request.step0.model_dump(),
-            step1_data=request.step1.model_dump(),
-            step2_data=request.step2.model_dump()
+        result = await openai_service.generate_options(
+            step0_data=step_data["step0"],
+            step1_data=step_data["step1"],
+            step2_data=step_data["step2"],
+            fresh=request.fresh
         )
         
         if not result["success"]:
-            raise HTTPException(status_code=500, detail=result.get("error", "LLM generation failed"))
+            # Transient upstream failures (rate limit, 5xx, timeout) are safe for the client to retry
+            status_code = 503 if result.get("retryable") else 500
+            raise HTTPException(status_code=status_code, detail=result.get("error", "LLM generation failed"))
         
         # Parse JSON response
         try:
             content = result["content"]
-            # Remove markdown code blocks if present
-            if content.startswith("```json"):
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif content.startswith("```"):
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            parsed_response = json.loads(content)
-            options = parsed_response.get("options", [])
+            options = parse_options(content)
             
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse LLM response as JSON: {str(e)}")
-            logger.error(f"Raw response: {result['content']}")
+        except orjson.JSONDecodeError as e:
+            logger.error("Failed to parse LLM response as JSON: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw response: %s", result['content'])
             raise HTTPException(status_code=500, detail="Failed to parse LLM response")
         
         # Log LLM generation
@@ -97,10 +143,11 @@ async def generate_options(request: GenerateOptionsRequest):
             prompt="Steps 0-2 data (see user_activity log)",
             response=content,
             model=result["model"],
-            tokens_used=result["tokens_used"]
+            tokens_used=result["tokens_used"],
+            cached=result.get("cached", False)
         )
         
-        logger.info(f"Successfully generated {len(options)} options for session: {request.sessionId}")
+        logger.debug("Successfully generated %d options for session: %s", len(options), request.sessionId)
         
         return GenerateOptionsResponse(
             success=True,
@@ -111,5 +158,190 @@ async def generate_options(request: GenerateOptionsRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Unexpected error in generate_options: {str(e)}")
+        logger.error("Unexpected error in generate_options: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/generate-options/stream")
+async def stream_generate_options(request: GenerateOptionsRequest):
+    """
+    Generate options like /generate-options, but forward LLM tokens as Server-Sent Events.
+    Emits "data" messages with {"delta": ...}, then a final "done" event carrying the
+    parsed GenerateOptionsResponse (or an "error" event).
+    """
+    logger.debug("Received streaming generate options request for session: %s", request.sessionId)
+    
+    step_data = _dump_steps(request)
+    
+    # Log user activity
+    log_user_activity(
+        session_id=request.sessionId,
+        activity_type="generate_options_stream_request",
+        data=step_data
+    )
+    
+    async def event_stream():
+        chunks = []
+        tokens_used = None
+        model = None
+        
+        try:
+            async for event in openai_service.stream_options(
+                step0_data=step_data["step0"],
+                step1_data=step_data["step1"],
+                step2_data=step_data["step2"]
+            ):
+                if "delta" in event:
+                    chunks.append(event["delta"])
+                    yield _sse({"delta": event["delta"]})
+                else:
+                    tokens_used = event["tokens_used"]
+                    model = event["model"]
+            
+            content = "".join(chunks)
+            options = parse_options(content)
+            
+        except orjson.JSONDecodeError as e:
+            logger.error("Failed to parse streamed LLM response as JSON: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw response: %s", "".join(chunks))
+            yield _sse({"success": False, "error": "Failed to parse LLM response"}, event="error")
+            return
+        except asyncio.TimeoutError:
+            logger.error("OpenAI streaming request timed out")
+            yield _sse({"success": False, "error": "OpenAI API request timed out"}, event="error")
+            return
+        except Exception as e:
+            logger.error("Unexpected error in stream_generate_options: %s", e)
+            yield _sse({"success": False, "error": str(e)}, event="error")
+            return
+        
+        # Log LLM generation
+        log_llm_generation(
+            session_id=request.sessionId,
+            prompt="Steps 0-2 data (see user_activity log)",
+            response=content,
+            model=model,
+            tokens_used=tokens_used
+        )
+        
+        logger.debug("Successfully streamed %d options for session: %s", len(options), request.sessionId)
+        
+        response = GenerateOptionsResponse(success=True, options=options, tokensUsed=tokens_used)
+        yield _sse(response.model_dump(), event="done")
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/generate-options/batch", response_model=BatchSubmitResponse)
+async def submit_generate_options_batch(request: BatchGenerateOptionsRequest):
+    """
+    Queue option generation for several sessions via the OpenAI Batch API.
+    Intended for bulk/precompute flows; poll GET /generate-options/batch/{batch_id} for results.
+    """
+    try:
+        logger.info("Received batch generate options request for %d sessions", len(request.requests))
+        
+        items = []
+        for index, item in enumerate(request.requests):
+            step_data = _dump_steps(item)
+            
+            log_user_activity(
+                session_id=item.sessionId,
+                activity_type="generate_options_batch_request",
+                data=step_data
+            )
+            
+            # custom_id must be unique within a batch; keep the session id recoverable
+            items.append({
+                "custom_id": f"{index}:{item.sessionId}",
+                "step0_data": step_data["step0"],
+                "step1_data": step_data["step1"],
+                "step2_data": step_data["step2"]
+            })
+        
+        result = await openai_service.submit_batch(items)
+        
+        if not result["success"]:
+            raise HTTPException(status_code=500, detail=result.get("error", "Batch submission failed"))
+        
+        return BatchSubmitResponse(
+            success=True,
+            batchId=result["batch_id"],
+            status=result["status"]
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in submit_generate_options_batch: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/generate-options/batch/{batch_id}", response_model=BatchResultResponse)
+async def get_generate_options_batch(batch_id: str):
+    """
+    Poll an options batch; once finished, parse each result and record it in the session LLM log.
+    Failed/expired/cancelled batches return their partial results plus an error message.
+    """
+    try:
+        result = await openai_service.retrieve_batch(batch_id)
+        
+        if not result["success"]:
+            raise HTTPException(status_code=500, detail=result.get("error", "Batch retrieval failed"))
+        
+        if "results" not in result:
+            return BatchResultResponse(success=True, status=result["status"])
+        
+        results = []
+        generations = []
+        for item in result["results"]:
+            session_id = item["custom_id"].partition(":")[2]
+            
+            if not item["success"]:
+                results.append(BatchOptionsResult(sessionId=session_id, success=False, error=item["error"]))
+                continue
+            
+            try:
+                options = parse_options(item["content"])
+            except orjson.JSONDecodeError as e:
+                logger.error("Failed to parse batch LLM response as JSON: %s", e)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Raw response: %s", item["content"])
+                results.append(BatchOptionsResult(
+                    sessionId=session_id, success=False, error="Failed to parse LLM response"
+                ))
+                continue
+            
+            generations.append((session_id, item))
+            results.append(BatchOptionsResult(
+                sessionId=session_id,
+                success=True,
+                options=options,
+                tokensUsed=item["tokens_used"]
+            ))
+        
+        # Polls may hit any worker (or repeat after a restart); log a batch's results only once
+        if generations and await claim_batch_log(batch_id):
+            for session_id, item in generations:
+                log_llm_generation(
+                    session_id=session_id,
+                    prompt=f"Steps 0-2 data (batch {batch_id}, see user_activity log)",
+                    response=item["content"],
+                    model=item["model"],
+                    tokens_used=item["tokens_used"]
+                )
+        
+        return BatchResultResponse(
+            success=True,
+            status=result["status"],
+            results=results,
+            error=result.get("error")
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in get_generate_options_batch: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -26,10 +26,10 @@ async def save_report_data(request: ReportDataRequest):
     Save complete worksheet data (Steps 0-4) to log file when user views report
     """
     try:
-        logger.info(f"Saving report data for session {request.sessionId}")
+        logger.debug("Saving report data for session %s", request.sessionId)
         
         # Log the complete report data
-        log_report_data(
+        await log_report_data(
             session_id=request.sessionId,
             step0_data=request.step0,
             step1_data=request.step1,
@@ -38,7 +38,7 @@ async def save_report_data(request: ReportDataRequest):
             step4_data=request.step4
         )
         
-        logger.info(f"Report data saved successfully for session {request.sessionId}")
+        logger.debug("Report data saved successfully for session %s", request.sessionId)
         
         return ReportDataResponse(
             success=True,
@@ -46,5 +46,5 @@ async def save_report_data(request: ReportDataRequest):
         )
         
     except Exception as e:
-        logger.error(f"Error saving report data: {str(e)}")
+        logger.error("Error saving report data: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,24 +1,150 @@
-import os
+import asyncio
+import hashlib
 import logging
-from openai import OpenAI
-from typing import List, Dict, Any
+import re
+import httpx
+import orjson
+from cachetools import TTLCache
+from functools import lru_cache
+from io import StringIO
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI
+from typing import AsyncIterator, List, Dict, Any, Tuple
+
+from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Per-attempt timeout; the SDK retries 408/409/429/5xx and connection errors
+# with exponential backoff + jitter
+OPENAI_ATTEMPT_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+OPENAI_MAX_RETRIES = 4
+
+# Upper bound on a whole OpenAI call including retries (seconds)
+OPENAI_REQUEST_TIMEOUT = 120
+
+# Completed generations are reused for identical inputs for this long (seconds)
+RESPONSE_CACHE_TTL = 600
+RESPONSE_CACHE_SIZE = 1024
+
+def _reused(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a shared result for callers that did not make the upstream call; no tokens were spent on them"""
+    if not result["success"]:
+        return result
+    return {
+        **result,
+        "cached": True,
+        "tokens_used": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
+
+# Fallback for responses still wrapped in a markdown code block
+_FENCE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.S)
+
+def parse_options(content: str) -> List[Dict[str, Any]]:
+    """Parse the options list out of an LLM JSON response (raises orjson.JSONDecodeError)"""
+    # Remove markdown code blocks if present
+    if m := _FENCE.match(content):
+        content = m.group(1)
+    
+    parsed_response = orjson.loads(content)
+    return parsed_response.get("options", [])
+
+# Keep-alive pool for api.openai.com
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60)
+
+# One HTTP/2 connection pool shared by every OpenAIService in the process
+_HTTP = None
+
+def _http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, opening a new one if none exists or the last was closed"""
+    global _HTTP
+    if _HTTP is None or _HTTP.is_closed:
+        _HTTP = httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=OPENAI_ATTEMPT_TIMEOUT)
+    return _HTTP
+
+async def close_http_client():
+    """Close the shared HTTP client; call on application shutdown (the next use opens a new one)"""
+    if _HTTP is not None:
+        await _HTTP.aclose()
+
+# Batch statuses after which no more results will appear
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# User prompt layout; each {stepN} is a rendered section or "" when the step has no data
+PROMPT_TEMPLATE = (
+    "# User Profile and Decision Context\n"
+    "{step0}{step1}{step2}"
+    "\n---\nBased on this information, generate exactly 5 personalized career/decision options."
+)
+
+# (data key, label) pairs rendered as "**label**: value" under each step header
+STEP0_HEADER = "## Step 0: Self Profile"
+STEP0_FIELDS = (
+    ("values", "Values"),
+    ("interests", "Interests"),
+    ("strengths", "Strengths"),
+    ("mustHaveConstraints", "Must-Have Constraints"),
+    ("niceToHaveConstraints", "Nice-to-Have Constraints"),
+    ("concerns", "Current Concerns"),
+)
+STEP1_HEADER = "## Step 1: Problem Definition"
+STEP1_FIELDS = (
+    ("problemDefinition", "Decision Problem"),
+    ("internalCues", "Internal Signals"),
+    ("externalCues", "External Signals"),
+    ("keyQuestions", "Key Questions"),
+)
+STEP2_HEADER = "## Step 2: Evaluation Criteria"
+STEP2_FIELDS = (
+    ("evaluationCriteria", "Comparison Criteria"),
+    ("constraints", "Additional Constraints"),
+)
+
 class OpenAIService:
     def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
+        config = settings()
+        api_key = config.openai_api_key
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
         
-        self.client = OpenAI(api_key=api_key)
-        self.model = os.getenv("OPENAI_MODEL", "gpt-4o")
+        self._api_key = api_key
+        self._client = None
+        self._client_http = None
+        self.model = config.model
+        
+        # Bound concurrent upstream calls and coalesce duplicate requests
+        self._sema = asyncio.Semaphore(config.max_concurrency)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+    
+    @property
+    def client(self) -> AsyncOpenAI:
+        """OpenAI client bound to the current shared HTTP client (rebuilt after a shutdown closed it)"""
+        http_client = _http_client()
+        if self._client_http is not http_client:
+            self._client_http = http_client
+            self._client = AsyncOpenAI(
+                api_key=self._api_key,
+                max_retries=OPENAI_MAX_RETRIES,
+                timeout=OPENAI_ATTEMPT_TIMEOUT,
+                http_client=http_client
+            )
+        return self._client
     
-    def generate_options(
+    async def warm_up(self):
+        """Open a pooled connection (TCP + TLS) to the API so the first user request skips the handshake"""
+        try:
+            # No retries: a failed warm-up must not hold up startup with backoff
+            await self.client.with_options(timeout=5, max_retries=0).models.list()
+            logger.debug("OpenAI connection pool warmed")
+        except Exception as e:
+            logger.warning("OpenAI connection warm-up failed: %s", e)
+    
+    async def generate_options(
         self,
         step0_data: Dict[str, Any],
         step1_data: Dict[str, Any],
-        step2_data: Dict[str, Any]
+        step2_data: Dict[str, Any],
+        fresh: bool = False
     ) -> Dict[str, Any]:
         """
         Generate career/decision options based on Steps 0-2 data using LLM
@@ -27,149 +153,409 @@ class OpenAIService:
             step0_data: Self-profile data (values, interests, strengths, constraints, concerns)
             step1_data: Communication data (problem definition, cues, questions)
             step2_data: Analysis data (evaluation criteria, constraints, information template)
+            fresh: Always sample new options instead of reusing a cached or in-flight result
         
         Returns:
             Dict containing generated options with titles, descriptions, and profiles
         """
         
-        # Build structured prompt
-        prompt = self._build_prompt(step0_data, step1_data, step2_data)
+        request_body = self._build_request_body(step0_data, step1_data, step2_data)
+        key = hashlib.blake2b(
+            orjson.dumps(request_body, option=orjson.OPT_SORT_KEYS)
+        ).hexdigest()
         
-        # Build dynamic system prompt based on informationTemplate
-        info_template = step2_data.get('informationTemplate', [])
-        system_prompt = self._build_system_prompt(info_template)
+        if fresh:
+            # Regenerate: sample anew, but let later identical requests reuse this result
+            task = asyncio.ensure_future(self._complete_and_cache(key, request_body))
+            return await asyncio.shield(task)
+        
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug("Returning cached OpenAI response")
+            return _reused(cached)
+        
+        # Identical request already in flight: share its result instead of calling again.
+        # The upstream call runs in its own task and every caller awaits it through
+        # shield(), so one caller being cancelled cannot fail the others.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._complete_and_cache(key, request_body))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight.pop(key, None))
+            return await asyncio.shield(task)
+        
+        logger.debug("Joining in-flight OpenAI request")
+        return _reused(await asyncio.shield(task))
+    
+    async def _complete_and_cache(self, key: str, request_body: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one upstream completion under the concurrency limit and cache a complete, parseable result"""
+        
+        async with self._sema:
+            result = await self._create_completion(request_body)
+        if result["success"] and result["finish_reason"] == "stop":
+            # Truncated or malformed output must not be replayed to retries
+            try:
+                parse_options(result["content"])
+            except Exception:
+                return result
+            self._cache[key] = result
+        return result
+    
+    async def stream_options(
+        self,
+        step0_data: Dict[str, Any],
+        step1_data: Dict[str, Any],
+        step2_data: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream option generation token-by-token
+        
+        Yields {"delta": str} for each content chunk, then a final
+        {"tokens_used": dict, "model": str}. API errors propagate to the caller.
+        """
+        
+        request_body = self._build_request_body(step0_data, step1_data, step2_data)
+        tokens_used = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        
+        logger.debug("Sending streaming request to OpenAI (%s)", self.model)
+        
+        async with self._sema:
+            stream = await asyncio.wait_for(
+                self.client.chat.completions.create(
+                    **request_body,
+                    stream=True,
+                    stream_options={"include_usage": True}
+                ),
+                timeout=OPENAI_REQUEST_TIMEOUT
+            )
+            
+            # Close the upstream response even if the client disconnects mid-stream
+            async with stream:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield {"delta": chunk.choices[0].delta.content}
+                    if chunk.usage:
+                        tokens_used = {
+                            "prompt_tokens": chunk.usage.prompt_tokens,
+                            "completion_tokens": chunk.usage.completion_tokens,
+                            "total_tokens": chunk.usage.total_tokens
+                        }
+        
+        logger.debug("OpenAI stream finished. Tokens used: %s", tokens_used['total_tokens'])
+        
+        yield {"tokens_used": tokens_used, "model": self.model}
+    
+    async def _create_completion(self, request_body: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a single chat completion request and normalize the result"""
         
         try:
-            logger.info(f"Sending request to OpenAI ({self.model})")
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=2000
+            logger.debug("Sending request to OpenAI (%s)", self.model)
+            
+            response = await asyncio.wait_for(
+                self.client.chat.completions.create(**request_body),
+                timeout=OPENAI_REQUEST_TIMEOUT
             )
             
             content = response.choices[0].message.content
+            finish_reason = response.choices[0].finish_reason
             tokens_used = {
                 "prompt_tokens": response.usage.prompt_tokens,
                 "completion_tokens": response.usage.completion_tokens,
                 "total_tokens": response.usage.total_tokens
             }
             
-            logger.info(f"OpenAI response received. Tokens used: {tokens_used['total_tokens']}")
+            logger.debug("OpenAI response received. Tokens used: %s", tokens_used['total_tokens'])
             
             return {
                 "success": True,
                 "content": content,
+                "finish_reason": finish_reason,
                 "tokens_used": tokens_used,
                 "model": self.model
             }
             
+        except asyncio.TimeoutError:
+            logger.error("OpenAI API request timed out after %ss", OPENAI_REQUEST_TIMEOUT)
+            return {
+                "success": False,
+                "error": "OpenAI API request timed out",
+                "retryable": True
+            }
+        except APIStatusError as e:
+            # 408/409/429/5xx reach here only once SDK retries are exhausted; other 4xx are not retried
+            retryable = e.status_code in (408, 409, 429) or e.status_code >= 500
+            if retryable:
+                logger.error("OpenAI API error %s after %d retries: %s", e.status_code, OPENAI_MAX_RETRIES, e)
+            else:
+                logger.error("OpenAI API rejected request (%s): %s", e.status_code, e)
+            return {
+                "success": False,
+                "error": str(e),
+                "retryable": retryable
+            }
+        except APIConnectionError as e:
+            logger.error("OpenAI API connection error after %d retries: %s", OPENAI_MAX_RETRIES, e)
+            return {
+                "success": False,
+                "error": str(e),
+                "retryable": True
+            }
+        except Exception as e:
+            logger.error("OpenAI API error: %s", e)
+            return {
+                "success": False,
+                "error": str(e),
+                "retryable": False
+            }
+    
+    async def submit_batch(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Submit option generation for several sessions through the OpenAI Batch API
+        
+        Batch jobs are billed at a discount and do not count against per-minute
+        rate limits, so they suit bulk/precompute flows that can wait for results.
+        
+        Args:
+            items: List of dicts with "custom_id", "step0_data", "step1_data", "step2_data"
+        
+        Returns:
+            Dict containing the created batch id and status
+        """
+        
+        lines = []
+        for item in items:
+            lines.append(orjson.dumps({
+                "custom_id": item["custom_id"],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_request_body(
+                    item["step0_data"], item["step1_data"], item["step2_data"]
+                )
+            }))
+        
+        try:
+            logger.info("Submitting batch of %d requests to OpenAI (%s)", len(items), self.model)
+            
+            batch_file = await self.client.files.create(
+                file=("batch_input.jsonl", b"\n".join(lines)),
+                purpose="batch"
+            )
+            batch = await self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            
+            logger.info("OpenAI batch created: %s", batch.id)
+            
+            return {
+                "success": True,
+                "batch_id": batch.id,
+                "status": batch.status
+            }
+            
         except Exception as e:
-            logger.error(f"OpenAI API error: {str(e)}")
+            logger.error("OpenAI batch submit error: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
     
+    async def retrieve_batch(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Poll a batch submitted with submit_batch and collect its output once finished
+        
+        Returns:
+            Dict containing batch status and, once the batch is terminal
+            (completed/failed/expired/cancelled), per-request results keyed by
+            custom_id (content, tokens_used, model or error) from both the
+            output and error files
+        """
+        
+        try:
+            batch = await self.client.batches.retrieve(batch_id)
+            if batch.status not in BATCH_TERMINAL_STATUSES:
+                return {
+                    "success": True,
+                    "status": batch.status
+                }
+            
+            results = []
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if file_id:
+                    results.extend(await self._read_batch_file(file_id))
+            
+            logger.info("OpenAI batch %s %s with %d results", batch_id, batch.status, len(results))
+            
+            result = {
+                "success": True,
+                "status": batch.status,
+                "results": results
+            }
+            if batch.status != "completed":
+                errors = batch.errors.data if batch.errors and batch.errors.data else []
+                result["error"] = "; ".join(e.message for e in errors if e.message) or f"Batch {batch.status}"
+            return result
+            
+        except Exception as e:
+            logger.error("OpenAI batch retrieve error: %s", e)
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    async def _read_batch_file(self, file_id: str) -> List[Dict[str, Any]]:
+        """Parse a batch output/error JSONL file into normalized per-request results"""
+        
+        output = await self.client.files.content(file_id)
+        
+        results = []
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            body = response.get("body") or {}
+            
+            if record.get("error") or response.get("status_code") != 200:
+                error = record.get("error") or body.get("error") or "Batch request failed"
+                if isinstance(error, dict):
+                    error = error.get("message") or error
+                results.append({
+                    "custom_id": record["custom_id"],
+                    "success": False,
+                    "error": str(error)
+                })
+                continue
+            
+            usage = body.get("usage", {})
+            results.append({
+                "custom_id": record["custom_id"],
+                "success": True,
+                "content": body["choices"][0]["message"]["content"],
+                "tokens_used": {
+                    "prompt_tokens": usage.get("prompt_tokens", 0),
+                    "completion_tokens": usage.get("completion_tokens", 0),
+                    "total_tokens": usage.get("total_tokens", 0)
+                },
+                "model": body.get("model", self.model)
+            })
+        
+        return results
+    
+    def _build_request_body(
+        self,
+        step0_data: Dict[str, Any],
+        step1_data: Dict[str, Any],
+        step2_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build chat completion parameters shared by live and batch requests"""
+        
+        # Build structured prompt
+        prompt = self._build_prompt(step0_data, step1_data, step2_data)
+        
+        # Build dynamic system prompt based on informationTemplate
+        info_template = step2_data.get('informationTemplate', [])
+        system_prompt = self._build_system_prompt(info_template)
+        
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.7,
+            "max_tokens": 2000,
+            # JSON mode: the model returns a bare JSON object, no markdown fences
+            "response_format": {"type": "json_object"}
+        }
+    
     def _build_prompt(
         self,
         step0_data: Dict[str, Any],
         step1_data: Dict[str, Any],
         step2_data: Dict[str, Any]
     ) -> str:
-        """Build structured prompt from Steps 0-2 data"""
-        
-        prompt_parts = ["# User Profile and Decision Context\n"]
-        
-        # Step 0: Self Profile
-        prompt_parts.append("## Step 0: Self Profile")
-        prompt_parts.append(f"**Values**: {', '.join(step0_data.get('values', []))}")
-        prompt_parts.append(f"**Interests**: {', '.join(step0_data.get('interests', []))}")
-        prompt_parts.append(f"**Strengths**: {', '.join(step0_data.get('strengths', []))}")
-        
-        must_have = step0_data.get('mustHaveConstraints', [])
-        nice_to_have = step0_data.get('niceToHaveConstraints', [])
-        if must_have:
-            prompt_parts.append(f"**Must-Have Constraints**: {', '.join(must_have)}")
-        if nice_to_have:
-            prompt_parts.append(f"**Nice-to-Have Constraints**: {', '.join(nice_to_have)}")
-        
-        concerns = step0_data.get('concerns', '')
-        if concerns:
-            prompt_parts.append(f"**Current Concerns**: {concerns}")
-        
-        # Step 1: Communication
-        prompt_parts.append("\n## Step 1: Problem Definition")
-        problem_def = step1_data.get('problemDefinition', '')
-        if problem_def:
-            prompt_parts.append(f"**Decision Problem**: {problem_def}")
-        
-        internal_cues = step1_data.get('internalCues', [])
-        external_cues = step1_data.get('externalCues', [])
-        if internal_cues:
-            prompt_parts.append(f"**Internal Signals**: {', '.join(internal_cues)}")
-        if external_cues:
-            prompt_parts.append(f"**External Signals**: {', '.join(external_cues)}")
-        
-        key_questions = step1_data.get('keyQuestions', [])
-        if key_questions:
-            prompt_parts.append(f"**Key Questions**: {', '.join(key_questions)}")
-        
-        # Step 2: Analysis
-        prompt_parts.append("\n## Step 2: Evaluation Criteria")
-        criteria = step2_data.get('evaluationCriteria', [])
-        if criteria:
-            prompt_parts.append(f"**Comparison Criteria**: {', '.join(criteria)}")
-        
-        constraints = step2_data.get('constraints', [])
-        if constraints:
-            prompt_parts.append(f"**Additional Constraints**: {', '.join(constraints)}")
-        
-        prompt_parts.append("\n---")
-        prompt_parts.append("Based on this information, generate exactly 5 personalized career/decision options.")
-        
-        return "\n".join(prompt_parts)
+        """Build structured prompt from Steps 0-2 data, omitting empty fields and steps"""
+        
+        return PROMPT_TEMPLATE.format(
+            step0=_render_section(STEP0_HEADER, STEP0_FIELDS, step0_data),
+            step1=_render_section(STEP1_HEADER, STEP1_FIELDS, step1_data),
+            step2=_render_section(STEP2_HEADER, STEP2_FIELDS, step2_data)
+        )
     
     def _build_system_prompt(self, info_template: list) -> str:
         """Build dynamic system prompt based on informationTemplate"""
         
-        # Build profile field list from informationTemplate
-        profile_fields = []
-        for item in info_template:
-            field_name = item.get('field', '')
-            description = item.get('description', '')
-            # Extract field key from "한글이름 (fieldKey)" format
-            if '(' in field_name and ')' in field_name:
-                field_key = field_name.split('(')[1].split(')')[0]
-                field_label = field_name.split('(')[0].strip()
-            else:
-                field_key = field_name.replace(' ', '_').lower()
-                field_label = field_name
-            
-            profile_fields.append({
-                'key': field_key,
-                'label': field_label,
-                'description': description
-            })
+        key = tuple((item.get('field', ''), item.get('description', '')) for item in info_template)
+        return _system_prompt_cached(key)
+
+def _compact(text: str) -> str:
+    """Collapse runs of whitespace so user input costs fewer prompt tokens"""
+    return " ".join(text.split())
+
+def _render_section(header: str, fields: Tuple[Tuple[str, str], ...], data: Dict[str, Any]) -> str:
+    """Render one step of the user prompt, or "" if none of its fields have content"""
+    
+    buf = None
+    for key, label in fields:
+        value = data.get(key)
+        if not value:
+            continue
         
-        # Build profile JSON structure
-        profile_json_fields = []
-        for field in profile_fields:
-            profile_json_fields.append(f'        "{field["key"]}": "{field["label"]} - {field["description"]}"')
+        if isinstance(value, str):
+            text = _compact(value)
+        else:
+            text = ", ".join(item for item in map(_compact, value) if item)
+        if not text:
+            continue
         
-        profile_json_str = ',\n'.join(profile_json_fields)
+        if buf is None:
+            buf = StringIO()
+            buf.write("\n")
+            buf.write(header)
+        buf.write(f"\n**{label}**: {text}")
+    
+    if buf is None:
+        return ""
+    buf.write("\n")
+    return buf.getvalue()
+
+@lru_cache(maxsize=128)
+def _system_prompt_cached(key: Tuple[Tuple[str, str], ...]) -> str:
+    """Build the system prompt for a (field, description) template key; cached since templates rarely change"""
+    
+    # Build profile field list from informationTemplate
+    profile_fields = []
+    for field_name, description in key:
+        # Extract field key from "한글이름 (fieldKey)" format
+        if '(' in field_name and ')' in field_name:
+            field_key = field_name.split('(')[1].split(')')[0]
+            field_label = field_name.split('(')[0].strip()
+        else:
+            field_key = field_name.replace(' ', '_').lower()
+            field_label = field_name
         
-        system_prompt = f"""당신은 CASVE (Communication, Analysis, Synthesis, Valuing, Execution) 의사결정 모델을 전문으로 하는 진로 상담 전문가입니다.
+        profile_fields.append({
+            'key': field_key,
+            'label': field_label,
+            'description': description
+        })
+    
+    # Build profile JSON structure
+    profile_json_fields = []
+    for field in profile_fields:
+        profile_json_fields.append(f'        "{field["key"]}": "{field["label"]} - {field["description"]}"')
+    
+    profile_json_str = ',\n'.join(profile_json_fields)
+    
+    system_prompt = f"""당신은 CASVE (Communication, Analysis, Synthesis, Valuing, Execution) 의사결정 모델을 전문으로 하는 진로 상담 전문가입니다.
 사용자의 프로필, 문제 정의, 분석 기준을 바탕으로 개인화된 진로 또는 의사결정 대안을 생성하는 것이 당신의 임무입니다.
 
 다음 조건을 충족하는 현실적이고 실행 가능한 대안을 정확히 5개 생성하세요:
@@ -194,5 +580,5 @@ class OpenAIService:
 
 반드시 유효한 JSON으로만 응답하고, 추가 텍스트는 작성하지 마세요. 모든 응답은 한글로 작성하세요.
 각 profile 필드는 위에 명시된 키를 정확히 사용하고, 해당 필드에 대한 구체적이고 유용한 정보를 제공하세요."""
-        
-        return system_prompt
+    
+    return system_prompt
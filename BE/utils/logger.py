@@ -1,85 +1,162 @@
+import asyncio
 import logging
-import json
+import logging.handlers
+import atexit
+import queue
 import os
-from datetime import datetime
+import orjson
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterator
+
+# Structured per-session records (user activity, LLM generations) go through this logger
+activity_logger = logging.getLogger("casve.activity")
+activity_logger.setLevel(logging.INFO)
+activity_logger.propagate = False
+
+_LOG_ROOT = Path("logs")
+_BATCH_MARKER_DIR = _LOG_ROOT / "_batches"
+
+_listener = None
+
+@lru_cache(maxsize=4096)
+def _session_dir(session_id: str) -> Path:
+    """Return logs/{session_id}, creating it only the first time a session is seen"""
+    session_dir = _LOG_ROOT / session_id
+    session_dir.mkdir(parents=True, exist_ok=True)
+    return session_dir
+
+def _timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+
+def _is_session_record(record: logging.LogRecord) -> bool:
+    return hasattr(record, "session_id")
+
+def _is_app_record(record: logging.LogRecord) -> bool:
+    return not _is_session_record(record)
+
+class SessionFileHandler(logging.Handler):
+    """Write structured records to logs/{session_id}/{log_file}; runs on the listener thread"""
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            log_file = _session_dir(record.session_id) / record.log_file
+
+            # Append-only JSONL: payload is pre-serialized, newline-terminated bytes
+            with open(log_file, 'ab', buffering=1 << 16) as f:
+                f.write(record.payload)
+        except Exception:
+            self.handleError(record)
+
+def setup_logging(level: str = "WARNING"):
+    """Setup logging configuration
+
+    The root level defaults to WARNING so per-request debug/info records are
+    dropped before formatting; session activity logs are unaffected.
+
+    Records are handed to a queue and written by a background QueueListener,
+    so request handlers never block on file I/O.
+    """
+    global _listener
+
+    # Idempotent: a second call (reload, re-import) must not add handlers or listeners
+    if _listener is not None:
+        return
+
+    _LOG_ROOT.mkdir(exist_ok=True)
+
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        _LOG_ROOT / 'app.log', maxBytes=50_000_000, backupCount=5, encoding='utf-8'
+    )
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+        handler.addFilter(_is_app_record)
+
+    session_handler = SessionFileHandler()
+    session_handler.addFilter(_is_session_record)
+
+    log_queue = queue.Queue(maxsize=10000)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
 
-def setup_logging():
-    """Setup logging configuration"""
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
     # Configure root logger
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_dir / 'app.log'),
-            logging.StreamHandler()
-        ]
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    root.addHandler(queue_handler)
+    activity_logger.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, stream_handler, session_handler
+    )
+    _listener.start()
+    atexit.register(_listener.stop)
+
+def _log_session_entry(session_id: str, log_file: str, entry: dict):
+    activity_logger.info(
+        "%s entry for session %s", log_file, session_id,
+        extra={
+            "session_id": session_id,
+            "log_file": log_file,
+            "payload": orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+        }
     )
 
 def log_user_activity(session_id: str, activity_type: str, data: dict):
-    """Log user activity to session-specific JSON file"""
-    session_dir = Path("logs") / session_id
-    session_dir.mkdir(parents=True, exist_ok=True)
-    log_file = session_dir / "user_activity.json"
-    
+    """Log user activity to session-specific JSONL file"""
     log_entry = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _timestamp(),
         "activity_type": activity_type,
         "data": data
     }
     
-    # Append to JSON file
-    logs = []
-    if log_file.exists():
-        with open(log_file, 'r', encoding='utf-8') as f:
-            try:
-                logs = json.load(f)
-            except json.JSONDecodeError:
-                logs = []
-    
-    logs.append(log_entry)
-    
-    with open(log_file, 'w', encoding='utf-8') as f:
-        json.dump(logs, f, ensure_ascii=False, indent=2)
+    _log_session_entry(session_id, "user_activity.jsonl", log_entry)
 
-def log_llm_generation(session_id: str, prompt: str, response: str, model: str, tokens_used: dict):
-    """Log LLM generation details to session-specific JSON file"""
-    session_dir = Path("logs") / session_id
-    session_dir.mkdir(parents=True, exist_ok=True)
-    log_file = session_dir / "llm_generations.json"
-    
+def log_llm_generation(session_id: str, prompt: str, response: str, model: str, tokens_used: dict, cached: bool = False):
+    """Log LLM generation details to session-specific JSONL file
+
+    cached marks a response reused from another call (cache hit or coalesced
+    request); its tokens_used is zero since no model call was made for it.
+    """
     log_entry = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _timestamp(),
         "model": model,
+        "cached": cached,
         "tokens_used": tokens_used,
         "prompt": prompt,
         "response": response
     }
     
-    logs = []
-    if log_file.exists():
-        with open(log_file, 'r', encoding='utf-8') as f:
-            try:
-                logs = json.load(f)
-            except json.JSONDecodeError:
-                logs = []
-    
-    logs.append(log_entry)
-    
-    with open(log_file, 'w', encoding='utf-8') as f:
-        json.dump(logs, f, ensure_ascii=False, indent=2)
+    _log_session_entry(session_id, "llm_generations.jsonl", log_entry)
 
-def log_report_data(session_id: str, step0_data: dict, step1_data: dict, step2_data: dict, step3_data: dict, step4_data: dict):
-    """Log complete report data (Steps 0-4) to session-specific JSON file"""
-    session_dir = Path("logs") / session_id
-    session_dir.mkdir(parents=True, exist_ok=True)
-    log_file = session_dir / "report_data.json"
+async def claim_batch_log(batch_id: str) -> bool:
+    """Claim the right to log a finished batch's results; True only for the first caller across all workers"""
+    return await asyncio.to_thread(_claim_batch_log_sync, batch_id)
+
+def _claim_batch_log_sync(batch_id: str) -> bool:
+    """Atomically create logs/_batches/{batch_id}.logged (blocking file I/O; run via claim_batch_log)"""
+    _BATCH_MARKER_DIR.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(_BATCH_MARKER_DIR / f"{batch_id}.logged", 'x'):
+            pass
+    except FileExistsError:
+        return False
+    return True
+
+async def log_report_data(session_id: str, step0_data: dict, step1_data: dict, step2_data: dict, step3_data: dict, step4_data: dict):
+    """Log complete report data (Steps 0-4) to session-specific JSON file without blocking the event loop"""
+    await asyncio.to_thread(
+        _log_report_data_sync, session_id, step0_data, step1_data, step2_data, step3_data, step4_data
+    )
+
+def _log_report_data_sync(session_id: str, step0_data: dict, step1_data: dict, step2_data: dict, step3_data: dict, step4_data: dict):
+    """Write the report snapshot (blocking file I/O; run via log_report_data)"""
+    log_file = _session_dir(session_id) / "report_data.json"
     
     log_entry = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _timestamp(),
         "step0": step0_data,
         "step1": step1_data,
         "step2": step2_data,
@@ -88,5 +165,17 @@ def log_report_data(session_id: str, step0_data: dict, step1_data: dict, step2_d
     }
     
     # For report data, we save the complete snapshot (not append)
-    with open(log_file, 'w', encoding='utf-8') as f:
-        json.dump(log_entry, f, ensure_ascii=False, indent=2)
+    with open(log_file, 'wb') as f:
+        f.write(orjson.dumps(log_entry, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+def read_logs(session_id: str, log_name: str) -> Iterator[dict]:
+    """Iterate entries of a session-specific JSONL log (e.g. "user_activity.jsonl")"""
+    log_file = _LOG_ROOT / session_id / log_name
+    if not log_file.exists():
+        return
+    
+    with open(log_file, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield orjson.loads(line)